@@ -12,9 +12,22 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from webdriver_manager.chrome import ChromeDriverManager
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 import re
 
+# Compiled once, used for every price on the page
+PRICE_RE = re.compile(r"[\d,.]+")
+
+# Matches "prod-holder" as one token of a class attribute, e.g. "prod-holder new"
+HOLDER_CLASS_RE = re.compile(r"(?:^|\s)prod-holder(?:\s|$)")
+
+# CSS selectors for each product field; soupsieve caches them once compiled
+BRAND_SELECTOR = "div.catalog-container div.catalog-name"
+NAME_SELECTOR = "div.product_name"
+DISCOUNT_SELECTOR = "div.frame-discount"
+RETAIL_PRICE_SELECTOR = "div.prod-price-wrap div.prod-catalog-retail-price"
+DISCOUNTED_PRICE_SELECTOR = "div.prod-price-wrap div.prod-aslowas"
+
 # Step 1 - Configuration and Data Fetching
 print("Setting up webdriver...")
 chrome_option = Options()
@@ -51,8 +64,10 @@ except (TimeoutError, Exception) as e:
 
 # Step 2 - Data Parsing and Extraction
 # Get page source and parse using BeautifulSoup
+# Only build the product holder subtrees; nav, footer and scripts are skipped
 content = driver.page_source
-page = BeautifulSoup(content, "html.parser")
+only_products = SoupStrainer("div", class_=HOLDER_CLASS_RE)
+page = BeautifulSoup(content, "lxml", parse_only=only_products)
 
 # Temporary storage for the extracted data
 glasses_data = []
@@ -62,45 +77,36 @@ product_holders = page.find_all("div", class_="prod-holder")
 print(f"Found {len(product_holders)} products")
 
 for holder in product_holders:
-    product_info = holder.find("div", class_="catalog-container")
-    if product_info:
-        brand_tag = product_info.find("div", class_="catalog-name")
-        brand = brand_tag.text.strip() if brand_tag else None  # product brand
-    else:
-        brand = None
+    # Product Brand
+    brand_tag = holder.select_one(BRAND_SELECTOR)
+    brand = brand_tag.text.strip() if brand_tag else None
 
     # Product Name
-    name_tag = holder.find("div", class_="product_name")
+    name_tag = holder.select_one(NAME_SELECTOR)
     name = name_tag.text.strip() if name_tag else None
 
     # Discount (force None if empty or only whitespace)
-    discount_tag = holder.find("div", class_="frame-discount")
+    discount_tag = holder.select_one(DISCOUNT_SELECTOR)
     if discount_tag:
         discount_text = discount_tag.get_text(strip=True).replace("\xa0", "")
         discount = discount_text if discount_text else None
     else:
         discount = None
 
-    # Prices
-    price_cnt = holder.find("div", class_="prod-price-wrap")
-    if price_cnt:
-        # Retail Price
-        retail_price_tag = price_cnt.find("div", class_="prod-catalog-retail-price")
-        if retail_price_tag:
-            match = re.findall(r"[\d,.]+", retail_price_tag.text)
-            retail_price = match[0].replace(",", "") if match else None
-        else:
-            retail_price = None
-
-        # Discounted Price
-        discounted_price_tag = price_cnt.find("div", class_="prod-aslowas")
-        if discounted_price_tag:
-            match = re.findall(r"[\d,.]+", discounted_price_tag.text)
-            discounted_price = match[0].replace(",", "") if match else None
-        else:
-            discounted_price = None
+    # Retail Price
+    retail_price_tag = holder.select_one(RETAIL_PRICE_SELECTOR)
+    if retail_price_tag:
+        match = PRICE_RE.search(retail_price_tag.text)
+        retail_price = match.group(0).replace(",", "") if match else None
     else:
         retail_price = None
+
+    # Discounted Price
+    discounted_price_tag = holder.select_one(DISCOUNTED_PRICE_SELECTOR)
+    if discounted_price_tag:
+        match = PRICE_RE.search(discounted_price_tag.text)
+        discounted_price = match.group(0).replace(",", "") if match else None
+    else:
         discounted_price = None
 
     # Collect extracted data
@@ -113,6 +119,9 @@ for holder in product_holders:
     }
     glasses_data.append(data)
 
+# The parsed tree is no longer needed once the data is extracted
+page.decompose()
+
 # Step 3 - Data Storage and Finalization
 # Save to CSV file
 if glasses_data:  # only proceed if list is not empty
@@ -0,0 +1,406 @@
+"""
+Selenium helpers for framedirect_pages.py.
+Only imported when a page needs JavaScript rendering (--render-js).
+"""
+
+# Import necessary libraries
+import os
+import re
+import time
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from webdriver_manager.chrome import ChromeDriverManager
+from typing import Optional
+
+# Page number in listing URLs such as ?p=2&type=pagestate
+_PAGE_RE = re.compile(r"p=(\d+)")
+
+# Resolved chromedriver path, reused across runs until it is a month old
+DRIVER_PATH_CACHE = os.path.expanduser("~/.cache/framedirect/chromedriver_path")
+DRIVER_PATH_MAX_AGE = 30 * 24 * 60 * 60
+
+# Runs in the page so overlays are handled in one WebDriver round trip
+CLOSE_OVERLAYS_JS = """
+var closed = 0;
+var overlay = document.querySelector('.fancybox-overlay');
+if (overlay && overlay.getClientRects().length > 0) {
+    try { jQuery.fancybox.close(); closed++; } catch (e) {}
+}
+document.querySelectorAll(
+    ".fancybox-close, .modal-close, .close, [aria-label='Close']"
+).forEach(function (btn) {
+    if (btn.getClientRects().length > 0) {
+        try { btn.click(); closed++; } catch (e) {}
+    }
+});
+document.body.dispatchEvent(
+    new KeyboardEvent('keydown', {key: 'Escape', keyCode: 27, bubbles: true})
+);
+return closed;
+"""
+
+
+def get_chromedriver_path() -> str:
+    """
+    Return the chromedriver path, asking webdriver-manager only when needed.
+
+    The path resolved by ChromeDriverManager is cached on disk and reused
+    while the driver file exists and the cache is under a month old.
+
+    Returns:
+        str: Path to the chromedriver executable
+    """
+    try:
+        if time.time() - os.path.getmtime(DRIVER_PATH_CACHE) < DRIVER_PATH_MAX_AGE:
+            with open(DRIVER_PATH_CACHE, encoding="utf-8") as cache_file:
+                driver_path = cache_file.read().strip()
+            if driver_path and os.path.exists(driver_path):
+                print(f"Using cached Chrome WebDriver at {driver_path}")
+                return driver_path
+    except OSError:
+        pass
+
+    print("Installing Chrome WebDriver...")
+    driver_path = ChromeDriverManager().install()
+
+    try:
+        os.makedirs(os.path.dirname(DRIVER_PATH_CACHE), exist_ok=True)
+        with open(DRIVER_PATH_CACHE, mode="w", encoding="utf-8") as cache_file:
+            cache_file.write(driver_path)
+    except OSError as e:
+        print(f"Could not cache Chrome WebDriver path: {e}")
+
+    return driver_path
+
+
+def setup_webdriver() -> webdriver.Chrome:
+    """
+    Configure and initialize Chrome WebDriver with appropriate options.
+
+    Returns:
+        webdriver.Chrome: Configured Chrome WebDriver instance
+    """
+    print("Setting up webdriver...")
+
+    chrome_option = Options()
+    # Temporarily disable headless mode for better debugging
+    # chrome_option.add_argument("--headless")  # Comment out for debugging
+    chrome_option.add_argument("--disable-gpu")
+    chrome_option.add_argument("--no-sandbox")
+    chrome_option.add_argument("--disable-dev-shm-usage")
+    chrome_option.add_argument("--disable-blink-features=AutomationControlled")
+    chrome_option.add_experimental_option("excludeSwitches", ["enable-automation"])
+    chrome_option.add_experimental_option("useAutomationExtension", False)
+    # Skip images, stylesheets and notifications; only the HTML is parsed
+    chrome_option.add_experimental_option(
+        "prefs",
+        {
+            "profile.managed_default_content_settings.images": 2,
+            "profile.managed_default_content_settings.stylesheets": 2,
+            "profile.default_content_setting_values.notifications": 2,
+        },
+    )
+    # Return from driver.get() on DOMContentLoaded instead of the full load event
+    chrome_option.page_load_strategy = "eager"
+    chrome_option.add_argument(
+        "user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.6778.265 Safari/537.36"
+    )
+    print("Done setting up options...")
+
+    # Install the chrome driver, or reuse the one installed on a previous run
+    service = Service(get_chromedriver_path())
+
+    print("Initializing WebDriver...")
+    driver = webdriver.Chrome(service=service, options=chrome_option)
+    print("WebDriver setup complete")
+
+    return driver
+
+
+def fetch_page_content(
+    driver: webdriver.Chrome, url: str, timeout: int = 15
+) -> Optional[str]:
+    """
+    Navigate to URL and wait for page content to load.
+
+    Args:
+        driver: Chrome WebDriver instance
+        url: URL to navigate to
+        timeout: Timeout in seconds to wait for page load
+
+    Returns:
+        str: Page source HTML if successful, None if failed
+    """
+    print(f"Visiting {url} page...")
+
+    try:
+        driver.get(url)
+
+        print("Waiting for product tiles to load...")
+        WebDriverWait(driver, timeout).until(
+            EC.presence_of_element_located((By.ID, "product-list-container"))
+        )
+        print("Page loaded successfully, proceeding to parse data...")
+
+        return driver.page_source
+
+    except Exception as e:
+        print(f"Error waiting for {url}: {e}")
+        return None
+
+
+def close_overlays(driver: webdriver.Chrome) -> None:
+    """
+    Close any overlays or popups that might interfere with navigation.
+
+    Args:
+        driver: Chrome WebDriver instance
+    """
+    try:
+        closed = driver.execute_script(CLOSE_OVERLAYS_JS)
+        if closed:
+            print(f"Closed {closed} overlay(s)")
+    except:
+        pass
+
+
+def navigate_to_next_page(
+    driver: webdriver.Chrome, current_page_num: int = 1, timeout: int = 15
+) -> bool:
+    """
+    Navigate to the next page using the next page button.
+
+    Args:
+        driver: Chrome WebDriver instance
+        current_page_num: Page number the browser is on, tracked by the caller
+        timeout: Timeout in seconds to wait for navigation
+
+    Returns:
+        bool: True if successfully navigated to next page, False otherwise
+    """
+    print("Looking for next page button...")
+
+    # Store current URL to verify navigation
+    current_url = driver.current_url
+
+    try:
+        # Multiple strategies to find the next button
+        next_button = None
+
+        # Strategy 1: Try aria-label="next page"
+        try:
+            next_button = WebDriverWait(driver, 5).until(
+                EC.element_to_be_clickable(
+                    (By.CSS_SELECTOR, 'a[aria-label="next page"]')
+                )
+            )
+            print("Found next button using aria-label='next page'")
+        except:
+            pass
+
+        # Strategy 2: Try different aria-label variations
+        if not next_button:
+            try:
+                next_button = WebDriverWait(driver, 5).until(
+                    EC.element_to_be_clickable(
+                        (By.CSS_SELECTOR, 'a[aria-label="nextpage"]')
+                    )
+                )
+                print("Found next button using aria-label='nextpage'")
+            except:
+                pass
+
+        # Strategy 3: Try by class and text content
+        if not next_button:
+            try:
+                next_button = WebDriverWait(driver, 5).until(
+                    EC.element_to_be_clickable(
+                        (
+                            By.XPATH,
+                            "//a[contains(@class, 'icon-cheveron-right') or contains(text(), 'next') or contains(@href, 'p=')]",
+                        )
+                    )
+                )
+                print("Found next button using class/text content")
+            except:
+                pass
+
+        # Strategy 4: Try finding by href pattern (p=X)
+        if not next_button:
+            try:
+                # Look for link with p= parameter that's greater than current page
+                next_page_num = current_page_num + 1
+                next_button = WebDriverWait(driver, 5).until(
+                    EC.element_to_be_clickable(
+                        (By.XPATH, f"//a[contains(@href, 'p={next_page_num}')]")
+                    )
+                )
+                print(f"Found next button using href pattern for page {next_page_num}")
+            except:
+                pass
+
+        if not next_button:
+            print("Could not find next page button with any strategy")
+            return False
+
+        # Get the href before clicking
+        next_href = next_button.get_attribute("href")
+        print(f"Next button href: {next_href}")
+
+        # Check if the button has a valid href
+        if not next_href or "javascript:" in next_href:
+            print("Next button has no valid href or is disabled")
+            return False
+
+        # Keep a handle on the current product list to detect when it is replaced
+        try:
+            old_content = driver.find_element(By.ID, "product-list-container")
+        except:
+            old_content = driver.find_element(By.TAG_NAME, "body")
+
+        # Close any overlays first
+        close_overlays(driver)
+
+        # Multiple click strategies
+        click_successful = False
+
+        # Strategy 1: JavaScript click (bypasses overlays)
+        try:
+            print("Attempting JavaScript click...")
+            driver.execute_script("arguments[0].click();", next_button)
+            click_successful = True
+            print("JavaScript click successful")
+        except Exception as js_error:
+            print(f"JavaScript click failed: {js_error}")
+
+        # Strategy 2: Direct navigation using href
+        if not click_successful:
+            try:
+                print("Attempting direct navigation using href...")
+                driver.get(next_href)
+                click_successful = True
+                print("Direct navigation successful")
+            except Exception as nav_error:
+                print(f"Direct navigation failed: {nav_error}")
+
+        # Strategy 3: Regular click as last resort
+        if not click_successful:
+            try:
+                print("Attempting regular click after closing overlays...")
+                driver.execute_script(
+                    "arguments[0].scrollIntoView({block: 'center'});", next_button
+                )
+                time.sleep(1)
+                close_overlays(driver)  # Close overlays again
+                next_button.click()
+                click_successful = True
+                print("Regular click successful")
+            except Exception as click_error:
+                print(f"Regular click failed: {click_error}")
+
+        if not click_successful:
+            print("All click strategies failed")
+            return False
+
+        # Wait for navigation: a URL change, or the old page content going
+        # stale when the product list is swapped in place without one
+        print("Waiting for page navigation...")
+        old_content_stale = EC.staleness_of(old_content)
+        try:
+            WebDriverWait(driver, timeout).until(
+                lambda d: d.current_url != current_url or old_content_stale(d)
+            )
+        except:
+            print("Warning: Page did not change before timeout, but continuing...")
+
+        # Wait for new page to load
+        try:
+            WebDriverWait(driver, timeout).until(
+                EC.presence_of_element_located((By.ID, "product-list-container"))
+            )
+        except:
+            print("Warning: Product container not found, but continuing...")
+
+        # Verify that we actually navigated
+        new_url = driver.current_url
+        new_page_num = page_number_from_url(new_url)
+
+        if new_url != current_url or new_page_num > current_page_num:
+            print(f"Successfully navigated to page {new_page_num}")
+            return True
+        else:
+            print(f"Navigation failed - still on same page {current_page_num}")
+            return False
+
+    except Exception as e:
+        print(f"Error navigating to next page: {e}")
+        print(f"Current URL: {driver.current_url}")
+
+        # Debug: Print available links
+        try:
+            links = driver.find_elements(By.TAG_NAME, "a")
+            print(f"Found {len(links)} links on page")
+            for link in links[:10]:  # Show first 10 links for debugging
+                href = link.get_attribute("href")
+                text = link.text.strip()
+                aria_label = link.get_attribute("aria-label")
+                if href and ("p=" in href or "next" in text.lower() or aria_label):
+                    print(
+                        f"  Link: href='{href}', text='{text}', aria-label='{aria_label}'"
+                    )
+        except:
+            pass
+
+        return False
+
+
+def page_number_from_url(url: str) -> int:
+    """
+    Extract the page number from a listing URL.
+
+    Args:
+        url: Listing page URL
+
+    Returns:
+        int: Page number, defaults to 1 if not found
+    """
+    # Extract page number from URL pattern: ?p=2&type=pagestate
+    if "p=" in url:
+        match = _PAGE_RE.search(url)
+        if match:
+            return int(match.group(1))
+    return 1
+
+
+def get_current_page_number(driver: webdriver.Chrome) -> int:
+    """
+    Extract current page number from the browser's URL.
+
+    Each call is a WebDriver round trip, so callers should track the page
+    number themselves and only use this to seed or verify it.
+
+    Args:
+        driver: Chrome WebDriver instance
+
+    Returns:
+        int: Current page number, defaults to 1 if not found
+    """
+    try:
+        return page_number_from_url(driver.current_url)
+    except:
+        return 1
+
+
+def cleanup_driver(driver: webdriver.Chrome) -> None:
+    """
+    Clean up and close the WebDriver.
+
+    Args:
+        driver: Chrome WebDriver instance to close
+    """
+    driver.quit()
+    print("Browser closed")
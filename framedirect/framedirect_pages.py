@@ -1,554 +1,626 @@
 """
 Modular version of framedirect.py.
 This script scrapes products on framedirect.com/eyeglasses with basic details.
+Pages are fetched over plain HTTP; pass --render-js to drive Chrome instead.
 """
 
 # Import necessary libraries
-import csv
-import json
+import argparse
+import asyncio
+import hashlib
+import os
+import random
 import time
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
-from bs4 import BeautifulSoup
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+import httpx
+import orjson
+from lxml import etree, html
 import re
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple, Union
+
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/131.0.6778.265 Safari/537.36"
+)
+
+
+def _has_class(name: str) -> str:
+    """Build an XPath predicate matching one token of an element's class list."""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+# Compiled once at import; lxml evaluates these in C on every product holder.
+HOLDER_XP = etree.XPath(f"//div[{_has_class('prod-holder')}]")
+
+# One union per holder returns every field element in a single traversal
+FIELDS_XP = etree.XPath(
+    " | ".join(
+        [
+            f".//div[{_has_class('catalog-container')}]"
+            f"//div[{_has_class('catalog-name')}]",
+            f".//div[{_has_class('product_name')}]",
+            f".//div[{_has_class('frame-discount')}]",
+            f".//div[{_has_class('prod-price-wrap')}]"
+            f"//div[{_has_class('prod-catalog-retail-price')}]",
+            f".//div[{_has_class('prod-price-wrap')}]"
+            f"//div[{_has_class('prod-aslowas')}]",
+        ]
+    )
+)
 
+# Class name of each field element and the column it fills
+FIELD_CLASSES = {
+    "catalog-name": "Brand",
+    "product_name": "Product_Name",
+    "prod-catalog-retail-price": "Retail_Price",
+    "prod-aslowas": "Discounted_Price",
+    "frame-discount": "Discount",
+}
 
-def setup_webdriver() -> webdriver.Chrome:
-    """
-    Configure and initialize Chrome WebDriver with appropriate options.
+# On-disk copies of fetched pages, reused by --cache runs for an hour
+CACHE_DIR = ".cache"
+CACHE_TTL = 3600
 
-    Returns:
-        webdriver.Chrome: Configured Chrome WebDriver instance
-    """
-    print("Setting up webdriver...")
-
-    chrome_option = Options()
-    # Temporarily disable headless mode for better debugging
-    # chrome_option.add_argument("--headless")  # Comment out for debugging
-    chrome_option.add_argument("--disable-gpu")
-    chrome_option.add_argument("--no-sandbox")
-    chrome_option.add_argument("--disable-dev-shm-usage")
-    chrome_option.add_argument("--disable-blink-features=AutomationControlled")
-    chrome_option.add_experimental_option("excludeSwitches", ["enable-automation"])
-    chrome_option.add_experimental_option("useAutomationExtension", False)
-    chrome_option.add_argument(
-        "user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.6778.265 Safari/537.36"
-    )
-    print("Done setting up options...")
+# Column order of the CSV output
+FIELDNAMES = ["Brand", "Product_Name", "Retail_Price", "Discounted_Price", "Discount"]
 
-    # Install the chrome driver
-    print("Installing Chrome WebDriver...")
-    service = Service(ChromeDriverManager().install())
+# Parser for already-decoded page source, ignoring any declared encoding
+_UTF8_PARSER = html.HTMLParser(encoding="utf-8")
 
-    print("Initializing WebDriver...")
-    driver = webdriver.Chrome(service=service, options=chrome_option)
-    print("WebDriver setup complete")
+# Encoding named by a leading <?xml ...?> declaration or a <meta> charset
+_XML_DECL_ENCODING_RE = re.compile(
+    rb"""^\s*<\?xml[^>]*?\bencoding\s*=\s*["']([\w.:-]+)["']""", re.I
+)
+_META_CHARSET_RE = re.compile(
+    rb"""<meta\b[^>]*?\bcharset\s*=\s*["']?([\w.:-]+)""", re.I
+)
 
-    return driver
+# Numeric part of a price such as "$1,176.00"
+_PRICE_RE = re.compile(r"[\d,.]+")
 
 
-def fetch_page_content(
-    driver: webdriver.Chrome, url: str, timeout: int = 15
-) -> Optional[str]:
+def create_client(max_connections: int = 16) -> httpx.AsyncClient:
     """
-    Navigate to URL and wait for page content to load.
+    Create an async HTTP/2 client that keeps connections alive between pages.
 
     Args:
-        driver: Chrome WebDriver instance
-        url: URL to navigate to
-        timeout: Timeout in seconds to wait for page load
+        max_connections: Maximum number of open connections
 
     Returns:
-        str: Page source HTML if successful, None if failed
+        httpx.AsyncClient: Client with browser User-Agent and connection limits
     """
-    print(f"Visiting {url} page...")
-
-    try:
-        driver.get(url)
-
-        print("Waiting for product tiles to load...")
-        WebDriverWait(driver, timeout).until(
-            EC.presence_of_element_located((By.ID, "product-list-container"))
-        )
-        print("Page loaded successfully, proceeding to parse data...")
-
-        return driver.page_source
-
-    except Exception as e:
-        print(f"Error waiting for {url}: {e}")
-        return None
+    limits = httpx.Limits(
+        max_connections=max_connections, max_keepalive_connections=max_connections
+    )
+    return httpx.AsyncClient(
+        http2=True,
+        headers={"User-Agent": USER_AGENT},
+        limits=limits,
+        follow_redirects=True,
+    )
 
 
-def extract_brand_info(holder) -> Optional[str]:
+def build_page_url(url: str, page_num: int) -> str:
     """
-    Extract brand information from product holder.
+    Build the listing URL for a given page number.
 
     Args:
-        holder: BeautifulSoup element containing product information
+        url: Base listing URL
+        page_num: 1-based page number
 
     Returns:
-        str: Brand name if found, None otherwise
+        str: URL of the requested page
     """
-    product_info = holder.find("div", class_="catalog-container")
-    if product_info:
-        brand_tag = product_info.find("div", class_="catalog-name")
-        return brand_tag.text.strip() if brand_tag else None
-    return None
+    if page_num <= 1:
+        return url
+    return f"{url}?p={page_num}&type=pagestate"
+
 
+def _cache_path(url: str) -> str:
+    """Return the cache file path for a URL."""
+    return os.path.join(CACHE_DIR, f"{hashlib.sha1(url.encode()).hexdigest()}.html")
 
-def extract_product_name(holder) -> Optional[str]:
+
+def read_cached_page(url: str, max_age: int = CACHE_TTL) -> Optional[bytes]:
     """
-    Extract product name from product holder.
+    Read a previously fetched page from the on-disk cache.
 
     Args:
-        holder: BeautifulSoup element containing product information
+        url: URL the page was fetched from
+        max_age: Maximum age in seconds of a usable cache entry
 
     Returns:
-        str: Product name if found, None otherwise
+        bytes: Cached page source if present and fresh, None otherwise
     """
-    name_tag = holder.find("div", class_="product_name")
-    return name_tag.text.strip() if name_tag else None
+    path = _cache_path(url)
+    try:
+        if time.time() - os.path.getmtime(path) >= max_age:
+            return None
+        with open(path, mode="rb") as cache_file:
+            return cache_file.read()
+    except OSError:
+        return None
 
 
-def extract_discount_info(holder) -> Optional[str]:
+def write_cached_page(url: str, page_source: bytes) -> None:
     """
-    Extract discount information from product holder.
+    Store a fetched page in the on-disk cache.
 
     Args:
-        holder: BeautifulSoup element containing product information
-
-    Returns:
-        str: Discount information if found, None otherwise
+        url: URL the page was fetched from
+        page_source: Raw HTML bytes of the page
     """
-    discount_tag = holder.find("div", class_="frame-discount")
-    if discount_tag:
-        discount_text = discount_tag.get_text(strip=True).replace("\xa0", "")
-        return discount_text if discount_text else None
-    return None
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(_cache_path(url), mode="wb") as cache_file:
+            cache_file.write(page_source)
+    except OSError as e:
+        print(f"Could not cache {url}: {e}")
 
 
-def extract_price_info(holder) -> tuple:
+async def fetch_page_content(
+    client: httpx.AsyncClient, url: str, timeout: int = 15, use_cache: bool = False
+) -> Optional[Tuple[bytes, Optional[str]]]:
     """
-    Extract retail and discounted price information from product holder.
+    Download the server-rendered HTML of a listing page.
 
     Args:
-        holder: BeautifulSoup element containing product information
+        client: HTTP client used for the request
+        url: URL to fetch
+        timeout: Timeout in seconds for the request
+        use_cache: Store the response in the on-disk cache
 
     Returns:
-        tuple: (retail_price, discounted_price) - both can be None if not found
+        tuple: (raw page HTML, charset from the Content-Type header or None)
+            if successful, None if failed
     """
-    retail_price = None
-    discounted_price = None
+    print(f"Visiting {url} page...")
+
+    try:
+        response = await client.get(url, timeout=timeout)
+        response.raise_for_status()
+    except Exception as e:
+        print(f"Error fetching {url}: {e}")
+        return None
 
-    price_cnt = holder.find("div", class_="prod-price-wrap")
-    if price_cnt:
-        # Extract retail price
-        retail_price_tag = price_cnt.find("div", class_="prod-catalog-retail-price")
-        if retail_price_tag:
-            match = re.findall(r"[\d,.]+", retail_price_tag.text)
-            retail_price = match[0].replace(",", "") if match else None
+    has_product_list = b"product-list-container" in response.content
+    if not has_product_list:
+        print(f"Warning: no product list in {url}, it may need --render-js")
 
-        # Extract discounted price
-        discounted_price_tag = price_cnt.find("div", class_="prod-aslowas")
-        if discounted_price_tag:
-            match = re.findall(r"[\d,.]+", discounted_price_tag.text)
-            discounted_price = match[0].replace(",", "") if match else None
+    # Only cache real listing pages (not challenge or consent pages), and
+    # honour servers that ask for the page not to be stored
+    if (
+        use_cache
+        and has_product_list
+        and "no-store" not in response.headers.get("Cache-Control", "")
+    ):
+        write_cached_page(url, response.content)
 
-    return retail_price, discounted_price
+    # Raw bytes plus the header charset; parse_product_data picks the encoding
+    return response.content, response.charset_encoding
+
+
+def _element_text(element) -> Optional[str]:
+    """Return the stripped text of an element, or None if it is missing."""
+    return element.text_content().strip() if element is not None else None
+
+
+def _price_value(element) -> Optional[str]:
+    """Return the first number in a price element without thousands separators."""
+    if element is None:
+        return None
+    match = _PRICE_RE.search(element.text_content())
+    return match.group(0).replace(",", "") if match else None
 
 
-def close_overlays(driver: webdriver.Chrome) -> None:
+def _discount_value(element) -> Optional[str]:
+    """Return the discount label, forcing None if it is empty or only whitespace."""
+    if element is None:
+        return None
+    discount_text = "".join(text.strip() for text in element.itertext()).replace(
+        "\xa0", ""
+    )
+    return discount_text if discount_text else None
+
+
+def extract_all(holder) -> Dict:
     """
-    Close any overlays or popups that might interfere with navigation.
+    Extract every product field from a product holder in one pass.
 
     Args:
-        driver: Chrome WebDriver instance
-    """
-    try:
-        # Close fancybox overlay
-        overlay = driver.find_element(By.CSS_SELECTOR, ".fancybox-overlay")
-        if overlay.is_displayed():
-            print("Found fancybox overlay, closing it...")
-            driver.execute_script("jQuery.fancybox.close();")
-            time.sleep(1)
-    except:
-        pass
+        holder: lxml element containing product information
 
+    Returns:
+        Dict: Brand, name, prices and discount - each None if not found
+    """
+    # Keep the first element found for each field, as find() did
+    tags = {}
+    for element in FIELDS_XP(holder):
+        for class_name in element.get("class", "").split():
+            field = FIELD_CLASSES.get(class_name)
+            if field and field not in tags:
+                tags[field] = element
+
+    return {
+        "Brand": _element_text(tags.get("Brand")),
+        "Product_Name": _element_text(tags.get("Product_Name")),
+        "Retail_Price": _price_value(tags.get("Retail_Price")),
+        "Discounted_Price": _price_value(tags.get("Discounted_Price")),
+        "Discount": _discount_value(tags.get("Discount")),
+    }
+
+
+def _html_parser(encoding: str) -> Optional[html.HTMLParser]:
+    """Build an HTML parser for an encoding, or None if libxml2 does not know it."""
     try:
-        # Close any modal dialogs
-        close_buttons = driver.find_elements(
-            By.CSS_SELECTOR,
-            ".fancybox-close, .modal-close, .close, [aria-label='Close']",
-        )
-        for btn in close_buttons:
-            if btn.is_displayed():
-                btn.click()
-                time.sleep(0.5)
-    except:
-        pass
+        return html.HTMLParser(encoding=encoding)
+    except LookupError:
+        return None
 
-    try:
-        # Press ESC to close any modal
-        from selenium.webdriver.common.keys import Keys
 
-        driver.find_element(By.TAG_NAME, "body").send_keys(Keys.ESCAPE)
-        time.sleep(0.5)
-    except:
-        pass
+def _parser_for_bytes(
+    page_source: bytes, charset: Optional[str] = None
+) -> Optional[html.HTMLParser]:
+    """
+    Choose the parser to decode raw page bytes with.
 
+    Args:
+        page_source: Raw HTML bytes of the page
+        charset: Charset from the HTTP Content-Type header, if any
 
-def navigate_to_next_page(driver: webdriver.Chrome, timeout: int = 15) -> bool:
+    Returns:
+        HTMLParser: Parser for the header charset, else the charset declared
+            in the document, else UTF-8 if the bytes decode as UTF-8;
+            None to leave detection to lxml
     """
-    Navigate to the next page using the next page button.
+    head = page_source[:2048]
+    declared = _XML_DECL_ENCODING_RE.search(head) or _META_CHARSET_RE.search(head)
+    candidates = [charset, declared.group(1).decode("ascii") if declared else None]
+
+    for encoding in candidates:
+        if encoding:
+            parser = _html_parser(encoding)
+            if parser is not None:
+                return parser
+
+    try:
+        page_source.decode("utf-8")
+        return _UTF8_PARSER
+    except UnicodeDecodeError:
+        return None
+
+
+def parse_product_data(
+    page_source: Union[str, bytes], charset: Optional[str] = None
+) -> List[Dict]:
+    """
+    Parse product data from HTML page source.
 
     Args:
-        driver: Chrome WebDriver instance
-        timeout: Timeout in seconds to wait for navigation
+        page_source: HTML source code of the page, raw bytes or decoded text
+        charset: Charset from the HTTP Content-Type header, for raw bytes
 
     Returns:
-        bool: True if successfully navigated to next page, False otherwise
+        List[Dict]: List of dictionaries containing product information
     """
-    print("Looking for next page button...")
+    try:
+        if isinstance(page_source, str):
+            # Decoded text may still carry an <?xml encoding=...?> declaration
+            tree = html.fromstring(page_source.encode("utf-8"), parser=_UTF8_PARSER)
+        else:
+            parser = _parser_for_bytes(page_source, charset)
+            tree = html.fromstring(page_source, parser=parser)
+    except etree.ParserError as e:
+        print(f"Could not parse page: {e}")
+        return []
 
-    # Store current URL to verify navigation
-    current_url = driver.current_url
-    current_page_num = get_current_page_number(driver)
+    glasses_data = []
 
-    try:
-        # Multiple strategies to find the next button
-        next_button = None
+    # Locate all product holders
+    product_holders = HOLDER_XP(tree)
+    print(f"Found {len(product_holders)} products")
 
-        # Strategy 1: Try aria-label="next page"
-        try:
-            next_button = WebDriverWait(driver, 5).until(
-                EC.element_to_be_clickable(
-                    (By.CSS_SELECTOR, 'a[aria-label="next page"]')
-                )
-            )
-            print("Found next button using aria-label='next page'")
-        except:
-            pass
+    for holder in product_holders:
+        glasses_data.append(extract_all(holder))
 
-        # Strategy 2: Try different aria-label variations
-        if not next_button:
-            try:
-                next_button = WebDriverWait(driver, 5).until(
-                    EC.element_to_be_clickable(
-                        (By.CSS_SELECTOR, 'a[aria-label="nextpage"]')
-                    )
-                )
-                print("Found next button using aria-label='nextpage'")
-            except:
-                pass
+    # Free the parsed nodes now rather than whenever the GC gets to them
+    del product_holders
+    tree.clear()
 
-        # Strategy 3: Try by class and text content
-        if not next_button:
-            try:
-                next_button = WebDriverWait(driver, 5).until(
-                    EC.element_to_be_clickable(
-                        (
-                            By.XPATH,
-                            "//a[contains(@class, 'icon-cheveron-right') or contains(text(), 'next') or contains(@href, 'p=')]",
-                        )
-                    )
-                )
-                print("Found next button using class/text content")
-            except:
-                pass
+    return glasses_data
 
-        # Strategy 4: Try finding by href pattern (p=X)
-        if not next_button:
-            try:
-                # Look for link with p= parameter that's greater than current page
-                next_page_num = current_page_num + 1
-                next_button = WebDriverWait(driver, 5).until(
-                    EC.element_to_be_clickable(
-                        (By.XPATH, f"//a[contains(@href, 'p={next_page_num}')]")
-                    )
-                )
-                print(f"Found next button using href pattern for page {next_page_num}")
-            except:
-                pass
 
-        if not next_button:
-            print("Could not find next page button with any strategy")
-            return False
+def _csv_escape(value) -> str:
+    """Format one CSV field the way csv.writer does with minimal quoting."""
+    if value is None:
+        return ""
+    text = str(value)
+    if any(char in text for char in ',"\r\n'):
+        return '"' + text.replace('"', '""') + '"'
+    return text
 
-        # Get the href before clicking
-        next_href = next_button.get_attribute("href")
-        print(f"Next button href: {next_href}")
 
-        # Check if the button has a valid href
-        if not next_href or "javascript:" in next_href:
-            print("Next button has no valid href or is disabled")
-            return False
+class ProductFileWriter:
+    """
+    Write product data to CSV and JSON files page by page as it is scraped.
 
-        # Close any overlays first
-        close_overlays(driver)
+    Files are opened on the first page with products, so an empty scrape
+    creates no files. The JSON file holds a single array with one record per line.
+    """
 
-        # Multiple click strategies
-        click_successful = False
+    def __init__(
+        self,
+        csv_filename: str = "pagedata/framedirect_data2.csv",
+        json_filename: str = "pagedata/framedirect_data2.json",
+    ):
+        """
+        Args:
+            csv_filename: Name of the CSV file to write
+            json_filename: Name of the JSON file to write
+        """
+        self.csv_filename = csv_filename
+        self.json_filename = json_filename
+        self.records_written = 0
+        self._csv_file = None
+        self._json_file = None
 
-        # Strategy 1: JavaScript click (bypasses overlays)
-        try:
-            print("Attempting JavaScript click...")
-            driver.execute_script("arguments[0].click();", next_button)
-            click_successful = True
-            print("JavaScript click successful")
-        except Exception as js_error:
-            print(f"JavaScript click failed: {js_error}")
-
-        # Strategy 2: Direct navigation using href
-        if not click_successful:
-            try:
-                print("Attempting direct navigation using href...")
-                driver.get(next_href)
-                click_successful = True
-                print("Direct navigation successful")
-            except Exception as nav_error:
-                print(f"Direct navigation failed: {nav_error}")
-
-        # Strategy 3: Regular click as last resort
-        if not click_successful:
-            try:
-                print("Attempting regular click after closing overlays...")
-                driver.execute_script(
-                    "arguments[0].scrollIntoView({block: 'center'});", next_button
-                )
-                time.sleep(1)
-                close_overlays(driver)  # Close overlays again
-                next_button.click()
-                click_successful = True
-                print("Regular click successful")
-            except Exception as click_error:
-                print(f"Regular click failed: {click_error}")
-
-        if not click_successful:
-            print("All click strategies failed")
-            return False
-
-        # Wait for navigation
-        print("Waiting for page navigation...")
-        time.sleep(3)
-
-        # Wait for new page to load
-        try:
-            WebDriverWait(driver, timeout).until(
-                EC.presence_of_element_located((By.ID, "product-list-container"))
+    def __enter__(self) -> "ProductFileWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def _open(self) -> None:
+        """Create the output directories and files and write the headers."""
+        for filename in (self.csv_filename, self.json_filename):
+            # Create directory if it doesn't exist
+            os.makedirs(os.path.dirname(filename) or ".", exist_ok=True)
+
+        self._csv_file = open(
+            self.csv_filename, mode="w", newline="", encoding="utf-8"
+        )
+        self._csv_file.write(",".join(FIELDNAMES) + "\r\n")
+
+        self._json_file = open(self.json_filename, mode="wb")
+        self._json_file.write(b"[")
+
+    def write_page(self, page_data: List[Dict]) -> None:
+        """
+        Append one page of products to both files.
+
+        Args:
+            page_data: List of dictionaries containing product information
+        """
+        if not page_data:
+            return
+        if self._csv_file is None:
+            self._open()
+
+        # Format the whole page up front and hand it to the file in one write
+        self._csv_file.write(
+            "".join(
+                ",".join(_csv_escape(record[field]) for field in FIELDNAMES) + "\r\n"
+                for record in page_data
             )
-        except:
-            print("Warning: Product container not found, but continuing...")
+        )
 
-        # Verify that we actually navigated
-        new_url = driver.current_url
-        new_page_num = get_current_page_number(driver)
+        # One compact record per line; orjson serializes in C without pretty-printing
+        for record in page_data:
+            self._json_file.write(b",\n" if self.records_written else b"\n")
+            self._json_file.write(orjson.dumps(record))
+            self.records_written += 1
 
-        if new_url != current_url or new_page_num > current_page_num:
-            print(f"Successfully navigated to page {new_page_num}")
-            return True
-        else:
-            print(f"Navigation failed - still on same page {current_page_num}")
-            return False
+    def close(self) -> None:
+        """Finish the JSON array and close both files."""
+        if self._csv_file is None:
+            print("No data to save")
+            return
 
-    except Exception as e:
-        print(f"Error navigating to next page: {e}")
-        print(f"Current URL: {driver.current_url}")
+        self._csv_file.close()
+        print(f"Data saved to {self.csv_filename}")
 
-        # Debug: Print available links
-        try:
-            links = driver.find_elements(By.TAG_NAME, "a")
-            print(f"Found {len(links)} links on page")
-            for link in links[:10]:  # Show first 10 links for debugging
-                href = link.get_attribute("href")
-                text = link.text.strip()
-                aria_label = link.get_attribute("aria-label")
-                if href and ("p=" in href or "next" in text.lower() or aria_label):
-                    print(
-                        f"  Link: href='{href}', text='{text}', aria-label='{aria_label}'"
-                    )
-        except:
-            pass
+        self._json_file.write(b"\n]\n")
+        self._json_file.close()
+        print(f"Saved {self.records_written} records to {self.json_filename}")
 
-        return False
+        self._csv_file = None
+        self._json_file = None
 
 
-def get_current_page_number(driver: webdriver.Chrome) -> int:
+async def fetch_with_limit(
+    client: httpx.AsyncClient,
+    semaphore: asyncio.Semaphore,
+    url: str,
+    use_cache: bool = False,
+) -> Optional[Tuple[bytes, Optional[str]]]:
     """
-    Extract current page number from the URL or page elements.
+    Fetch a page once a concurrency slot is free, after a short random pause.
 
     Args:
-        driver: Chrome WebDriver instance
+        client: HTTP client used for the request
+        semaphore: Semaphore bounding the number of requests in flight
+        url: URL to fetch
+        use_cache: Serve fresh pages from, and save new pages to, the disk cache
 
     Returns:
-        int: Current page number, defaults to 1 if not found
+        tuple: (raw page HTML, header charset or None) if successful,
+            None if failed
     """
-    try:
-        current_url = driver.current_url
-        # Extract page number from URL pattern: ?p=2&type=pagestate
-        if "p=" in current_url:
-            import re
+    if use_cache:
+        page_source = read_cached_page(url)
+        if page_source is not None:
+            print(f"Using cached copy of {url}")
+            # The header charset is not cached; the page's own declaration is used
+            return page_source, None
 
-            match = re.search(r"p=(\d+)", current_url)
-            if match:
-                return int(match.group(1))
-        return 1
-    except:
-        return 1
+    async with semaphore:
+        # 0-500 ms in 100 ms steps keeps concurrent requests from arriving in a burst
+        await asyncio.sleep(random.randint(0, 5) * 0.1)
+        return await fetch_page_content(client, url, use_cache=use_cache)
 
 
-def parse_product_data(page_source: str) -> List[Dict]:
+async def fetch_and_parse(
+    client: httpx.AsyncClient,
+    semaphore: asyncio.Semaphore,
+    pool: Optional[ProcessPoolExecutor],
+    url: str,
+    use_cache: bool = False,
+) -> Optional[List[Dict]]:
     """
-    Parse product data from HTML page source.
+    Fetch a page on the event loop and parse it in a worker process.
 
     Args:
-        page_source: HTML source code of the page
+        client: HTTP client used for the request
+        semaphore: Semaphore bounding the number of requests in flight
+        pool: Process pool that runs parse_product_data, None to parse in-process
+        url: URL to fetch
+        use_cache: Use the on-disk page cache
 
     Returns:
-        List[Dict]: List of dictionaries containing product information
+        List[Dict]: Product data for the page, None if the fetch failed
     """
-    page = BeautifulSoup(page_source, "html.parser")
-    glasses_data = []
-
-    # Locate all product holders
-    product_holders = page.find_all("div", class_="prod-holder")
-    print(f"Found {len(product_holders)} products")
+    page = await fetch_with_limit(client, semaphore, url, use_cache)
+    if page is None:
+        return None
 
-    for holder in product_holders:
-        # Extract all product information
-        brand = extract_brand_info(holder)
-        name = extract_product_name(holder)
-        discount = extract_discount_info(holder)
-        retail_price, discounted_price = extract_price_info(holder)
-
-        # Collect extracted data
-        data = {
-            "Brand": brand,
-            "Product_Name": name,
-            "Retail_Price": retail_price,
-            "Discounted_Price": discounted_price,
-            "Discount": discount,
-        }
-        glasses_data.append(data)
+    page_source, charset = page
+    if pool is None:
+        return parse_product_data(page_source, charset)
 
-    return glasses_data
+    # Only the raw HTML crosses the process boundary, never a parsed tree
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        pool, parse_product_data, page_source, charset
+    )
 
 
-def save_to_csv(
-    data: List[Dict], filename: str = "pagedata/framedirect_data2.csv"
-) -> bool:
+async def scrape_all_pages(
+    page_urls: List[str],
+    writer: ProductFileWriter,
+    max_concurrency: int = 10,
+    use_cache: bool = False,
+) -> int:
     """
-    Save product data to CSV file.
+    Download every page URL on a single event loop, parsing across CPU cores.
+
+    Pages are written in order as soon as each one is ready, and scraping
+    stops at the first page that fails or has no products.
 
     Args:
-        data: List of dictionaries containing product information
-        filename: Name of the CSV file to save
+        page_urls: URLs to fetch
+        writer: Output writer that receives each page of products
+        max_concurrency: Maximum number of requests in flight
+        use_cache: Use the on-disk page cache
 
     Returns:
-        bool: True if successful, False otherwise
-    """
-    if not data:
-        print("No data found, CSV not created.")
-        return False
-
-    try:
-        # Create directory if it doesn't exist
-        import os
-
-        os.makedirs(os.path.dirname(filename), exist_ok=True)
-
-        column_names = data[0].keys()
-        with open(filename, mode="w", newline="", encoding="utf-8") as csv_file:
-            dict_writer = csv.DictWriter(csv_file, fieldnames=column_names)
-            dict_writer.writeheader()
-            dict_writer.writerows(data)
-        print(f"Data saved to {filename}")
-        return True
-    except Exception as e:
-        print(f"Error saving CSV file: {e}")
-        return False
-
+        int: Number of pages scraped
+    """
+    pages_scraped = 0
+
+    # One worker per page at most; a single page is cheaper to parse in-process
+    # than to start (and, under spawn, re-import everything in) a worker for
+    pool_size = min(os.cpu_count() or 1, len(page_urls))
+    if pool_size > 1:
+        pool_context = ProcessPoolExecutor(max_workers=pool_size)
+    else:
+        pool_context = nullcontext()
+
+    with pool_context as pool:
+        async with create_client() as client:
+            semaphore = asyncio.Semaphore(max_concurrency)
+            tasks = [
+                asyncio.create_task(
+                    fetch_and_parse(client, semaphore, pool, page_url, use_cache)
+                )
+                for page_url in page_urls
+            ]
 
-def save_to_json(
-    data: List[Dict], filename: str = "pagedata/framedirect_data2.json"
-) -> bool:
-    """
-    Save product data to JSON file.
+            try:
+                for page_num, task in enumerate(tasks, start=1):
+                    page_data = await task
+                    print(f"\n--- Scraping Page {page_num} ---")
 
-    Args:
-        data: List of dictionaries containing product information
-        filename: Name of the JSON file to save
+                    if page_data is None:
+                        print("Failed to fetch page content")
+                        break
 
-    Returns:
-        bool: True if successful, False otherwise
-    """
-    try:
-        # Create directory if it doesn't exist
-        import os
+                    writer.write_page(page_data)
+                    pages_scraped += 1
 
-        os.makedirs(os.path.dirname(filename), exist_ok=True)
+                    if page_data:
+                        print(f"Scraped {len(page_data)} products from page {page_num}")
+                    else:
+                        print(f"No products found on page {page_num}, stopping")
+                        break
+            finally:
+                # Drop pages past the last one we need before the client closes
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
 
-        with open(filename, mode="w", encoding="utf-8") as json_file:
-            json.dump(data, json_file, indent=4)
-        print(f"Saved {len(data)} records to {filename}")
-        return True
-    except Exception as e:
-        print(f"Error saving JSON file: {e}")
-        return False
+    return pages_scraped
 
 
-def cleanup_driver(driver: webdriver.Chrome) -> None:
+def scrape_pages_over_http(
+    url: str,
+    max_pages: int,
+    writer: ProductFileWriter,
+    max_concurrency: int = 10,
+    use_cache: bool = False,
+) -> int:
     """
-    Clean up and close the WebDriver.
+    Fetch listing pages concurrently by URL and parse the products on each.
 
     Args:
-        driver: Chrome WebDriver instance to close
+        url: URL of the first listing page
+        max_pages: Maximum number of pages to scrape
+        writer: Output writer that receives each page of products
+        max_concurrency: Number of pages downloaded at the same time
+        use_cache: Use the on-disk page cache
+
+    Returns:
+        int: Number of pages scraped
     """
-    driver.quit()
-    print("Browser closed")
+    page_urls = [build_page_url(url, page_num) for page_num in range(1, max_pages + 1)]
+    return asyncio.run(
+        scrape_all_pages(page_urls, writer, max_concurrency, use_cache)
+    )
 
 
-def scrape_framedirect_eyeglasses(
-    url: str = "https://www.framesdirect.com/eyeglasses/",
-    csv_filename: str = "pagedata/framedirect_data2.csv",
-    json_filename: str = "pagedata/framedirect_data2.json",
-    max_pages: int = 1,
-) -> List[Dict]:
+def scrape_pages_with_browser(
+    url: str, max_pages: int, writer: ProductFileWriter
+) -> int:
     """
-    Main function to scrape eyeglasses data from framedirect.com
+    Drive Chrome through the listing pages for content that needs JavaScript.
 
     Args:
-        url: URL to scrape from
-        csv_filename: Name for CSV output file
-        json_filename: Name for JSON output file
-        max_pages: Maximum number of pages to scrape (default: 1)
+        url: URL of the first listing page
+        max_pages: Maximum number of pages to scrape
+        writer: Output writer that receives each page of products
 
     Returns:
-        List[Dict]: List of dictionaries containing product information
+        int: Number of pages scraped
     """
+    # Selenium is only needed here, so keep it out of the default HTTP path
+    import framedirect_browser as browser
+
     driver = None
-    all_glasses_data = []
+    pages_scraped = 0
 
     try:
         # Step 1: Setup WebDriver
-        driver = setup_webdriver()
+        driver = browser.setup_webdriver()
 
         # Step 2: Start scraping from first page
-        page_source = fetch_page_content(driver, url)
+        page_source = browser.fetch_page_content(driver, url)
         if not page_source:
             print("Failed to fetch page content")
-            return []
+            return pages_scraped
 
-        pages_scraped = 0
-
-        # Step 3: Loop through pages
+        # Step 3: Loop through pages, tracking the page number locally
+        current_page = browser.get_current_page_number(driver)
         while pages_scraped < max_pages:
-            current_page = get_current_page_number(driver)
             print(f"\n--- Scraping Page {current_page} ---")
 
             # Get current page source
@@ -560,60 +632,87 @@ def scrape_framedirect_eyeglasses(
 
             # Parse product data from current page
             page_data = parse_product_data(current_page_source)
+            writer.write_page(page_data)
+            pages_scraped += 1
 
             if page_data:
-                all_glasses_data.extend(page_data)
                 print(f"Scraped {len(page_data)} products from page {current_page}")
             else:
                 print(f"No products found on page {current_page}")
 
-            pages_scraped += 1
-
             # Check if we need to navigate to next page
             if pages_scraped < max_pages:
                 print(
                     f"\n🔄 Attempting to navigate from page {current_page} to page {current_page + 1}..."
                 )
-                print(f"Current URL: {driver.current_url}")
 
-                navigation_success = navigate_to_next_page(driver)
+                navigation_success = browser.navigate_to_next_page(
+                    driver, current_page
+                )
 
                 if navigation_success:
                     print(f"✅ Successfully navigated to next page")
-                    # Verify we're actually on a new page
-                    new_page_num = get_current_page_number(driver)
-                    print(f"New page number: {new_page_num}")
-                    print(f"New URL: {driver.current_url}")
+                    current_page += 1
                 else:
                     print("❌ Could not navigate to next page or reached last page")
                     print("This might be the last available page or navigation failed")
                     break
 
-                # Small delay between page navigations
-                print("⏳ Waiting before next page...")
-                time.sleep(3)
+        return pages_scraped
 
-        print(f"\n=== Scraping Summary ===")
-        print(f"Pages scraped: {pages_scraped}")
-        print(f"Total products found: {len(all_glasses_data)}")
+    finally:
+        if driver:
+            browser.cleanup_driver(driver)
 
-        # Step 4: Save data to files
-        if all_glasses_data:
-            save_to_csv(all_glasses_data, csv_filename)
-            save_to_json(all_glasses_data, json_filename)
-        else:
-            print("No data to save")
 
-        return all_glasses_data
+def scrape_framedirect_eyeglasses(
+    url: str = "https://www.framesdirect.com/eyeglasses/",
+    csv_filename: str = "pagedata/framedirect_data2.csv",
+    json_filename: str = "pagedata/framedirect_data2.json",
+    max_pages: int = 1,
+    render_js: bool = False,
+    use_cache: bool = False,
+) -> int:
+    """
+    Main function to scrape eyeglasses data from framedirect.com
+
+    Products are written to the output files page by page, so memory use
+    does not grow with the number of pages.
+
+    Args:
+        url: URL to scrape from
+        csv_filename: Name for CSV output file
+        json_filename: Name for JSON output file
+        max_pages: Maximum number of pages to scrape (default: 1)
+        render_js: Render pages in Chrome instead of fetching plain HTML
+        use_cache: Reuse pages fetched within the last hour (for development)
+
+    Returns:
+        int: Number of products scraped
+    """
+    writer = ProductFileWriter(csv_filename, json_filename)
+
+    try:
+        with writer:
+            # Fetch, parse and save the listing pages
+            if render_js:
+                pages_scraped = scrape_pages_with_browser(url, max_pages, writer)
+            else:
+                pages_scraped = scrape_pages_over_http(
+                    url, max_pages, writer, use_cache=use_cache
+                )
+
+            print(f"\n=== Scraping Summary ===")
+            print(f"Pages scraped: {pages_scraped}")
+            print(f"Total products found: {writer.records_written}")
+
+        return writer.records_written
 
     except Exception as e:
         print(f"An error occurred during scraping: {e}")
-        return all_glasses_data
+        return writer.records_written
 
     finally:
-        # Step 5: Cleanup
-        if driver:
-            cleanup_driver(driver)
         print("End of Web Extraction")
 
 
@@ -666,8 +765,26 @@ if __name__ == "__main__":
     # Direct page control - Change this number to scrape different number of pages
     PAGES_TO_SCRAPE = 3  # ← CHANGE THIS NUMBER TO SCRAPE MORE/FEWER PAGES
 
-    print(f"Configured to scrape {PAGES_TO_SCRAPE} page(s) of eyeglasses data.")
-    print(f"Starting scrape for {PAGES_TO_SCRAPE} page(s)...")
+    parser = argparse.ArgumentParser(description="Scrape framedirect.com eyeglasses")
+    parser.add_argument(
+        "--pages", type=int, default=PAGES_TO_SCRAPE, help="Number of pages to scrape"
+    )
+    parser.add_argument(
+        "--render-js",
+        action="store_true",
+        help="Render pages in Chrome (Selenium) instead of fetching plain HTML",
+    )
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="Reuse pages fetched within the last hour (for development)",
+    )
+    args = parser.parse_args()
 
-    scraped_data = scrape_framedirect_eyeglasses(max_pages=PAGES_TO_SCRAPE)
-    print(f"\nScraping completed. Total products scraped: {len(scraped_data)}")
+    print(f"Configured to scrape {args.pages} page(s) of eyeglasses data.")
+    print(f"Starting scrape for {args.pages} page(s)...")
+
+    products_scraped = scrape_framedirect_eyeglasses(
+        max_pages=args.pages, render_js=args.render_js, use_cache=args.cache
+    )
+    print(f"\nScraping completed. Total products scraped: {products_scraped}")